@@ -117,12 +117,8 @@ def get_current_agent(authorization: Optional[str] = Header(None), db: Session =
         "token": agent.token
     }
 
-@app.post("/events")
-async def create_event(event: EventCreate, current_agent=Depends(get_current_agent), db: Session = Depends(get_db)):
-    """Submit an event to the stream"""
-    
-    body_bytes = event.body.encode('utf-8')
-    
+def resolve_event_id(event: EventCreate) -> str:
+    """Validate a client-provided event ID, or generate one if absent"""
     if event.id:
         # Client provided ID - use it directly
         event_id = event.id
@@ -135,9 +131,26 @@ async def create_event(event: EventCreate, current_agent=Depends(get_current_age
             bytes.fromhex(event_id)  # Validate it's valid hex
         except ValueError:
             raise HTTPException(status_code=400, detail="Event ID must be valid hex")
-    else:
-        # Fallback: generate simple random ID (for backwards compatibility)
-        event_id = generate_256bit_id()
+        return event_id
+    
+    # Fallback: generate simple random ID (for backwards compatibility)
+    return generate_256bit_id()
+
+def event_broadcast_data(event: Event) -> dict:
+    """Event metadata pushed to WebSocket watchers"""
+    return {
+        "id": event.id,
+        "agent_id": event.agent_id,
+        "timestamp": event.timestamp.isoformat() + 'Z',
+        "body_length": len(event.body) if event.body else 0
+    }
+
+@app.post("/events")
+async def create_event(event: EventCreate, current_agent=Depends(get_current_agent), db: Session = Depends(get_db)):
+    """Submit an event to the stream"""
+    
+    body_bytes = event.body.encode('utf-8')
+    event_id = resolve_event_id(event)
     
     new_event = Event(
         id=event_id,
@@ -149,13 +162,7 @@ async def create_event(event: EventCreate, current_agent=Depends(get_current_age
     db.commit()
     
     # Broadcast to WebSocket connections
-    event_data = {
-        "id": new_event.id,
-        "agent_id": new_event.agent_id,
-        "timestamp": new_event.timestamp.isoformat() + 'Z',
-        "body_length": len(new_event.body) if new_event.body else 0
-    }
-    await event_broker.broadcast_event(event_data, new_event.id)
+    await event_broker.broadcast_event(event_broadcast_data(new_event), new_event.id)
     
     return {
         "id": new_event.id,
@@ -163,6 +170,37 @@ async def create_event(event: EventCreate, current_agent=Depends(get_current_age
         "timestamp": new_event.timestamp.isoformat() + 'Z'
     }
 
+@app.post("/events/batch")
+async def create_events_batch(events: List[EventCreate], current_agent=Depends(get_current_agent), db: Session = Depends(get_db)):
+    """Submit several events in one request and one transaction"""
+    
+    # Validate every ID before writing anything
+    event_ids = [resolve_event_id(event) for event in events]
+    
+    new_events = []
+    for event, event_id in zip(events, event_ids):
+        new_event = Event(
+            id=event_id,
+            agent_id=current_agent["id"],
+            timestamp=datetime.utcnow(),
+            body=event.body.encode('utf-8')
+        )
+        db.add(new_event)
+        new_events.append(new_event)
+    db.commit()
+    
+    for new_event in new_events:
+        await event_broker.broadcast_event(event_broadcast_data(new_event), new_event.id)
+    
+    return [
+        {
+            "id": new_event.id,
+            "agent_id": new_event.agent_id,
+            "timestamp": new_event.timestamp.isoformat() + 'Z'
+        }
+        for new_event in new_events
+    ]
+
 @app.websocket("/events/watch_ws")
 async def websocket_watch_events(
     websocket: WebSocket,
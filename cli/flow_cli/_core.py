@@ -0,0 +1,711 @@
+"""
+Implementation of the hot `flow add` and `flow nc` paths, plus the config,
+crypto and HTTP helpers they share with the rest of the CLI.
+
+This module deliberately does not import click: the `flow` entry point
+(_fast.py) calls into it directly for `add` and `nc`, so those commands
+never pay for importing click or building the command group. main.py
+imports everything it needs from here.
+"""
+import binascii
+import functools
+import json
+import sys
+import os
+import re
+import hashlib
+import hmac
+import secrets
+from pathlib import Path
+
+def echo(message: str = "", err: bool = False):
+    """Print a line to stdout, or stderr with err=True (like click.echo)"""
+    stream = sys.stderr if err else sys.stdout
+    stream.write(message + "\n")
+    stream.flush()
+
+# requests, websockets, asyncio etc. are imported inside the functions that
+# use them so that short-lived commands like `flow add` start quickly.
+
+def _json_loads(data):
+    """
+    Parse JSON with orjson when installed (pip install flow-pubsub-cli[fast]),
+    falling back to json.loads. The import is deferred to the first call,
+    which then rebinds _json_loads to the chosen parser.
+    """
+    global _json_loads
+    try:
+        import orjson
+        _json_loads = orjson.loads
+    except ImportError:
+        _json_loads = json.loads
+    return _json_loads(data)
+
+CONFIG_DIR = Path.home() / ".flow"
+TOKEN_FILE = CONFIG_DIR / "token"
+CONFIG_FILE = CONFIG_DIR / "config.json"
+CLIENT_SECRET_FILE = CONFIG_DIR / "client_secret"
+
+# Raw hex prefix: at least 64 bits (16 hex chars)
+_HEX_PREFIX_RE = re.compile(r'[0-9a-fA-F]{16,}\Z')
+
+def ensure_config_dir():
+    CONFIG_DIR.mkdir(exist_ok=True)
+
+# In-memory copies of the files under ~/.flow. Each is read at most once per
+# process and kept up to date by the matching save_* function.
+_UNSET = object()
+_config_cache = _UNSET
+_token_cache = _UNSET
+_client_secret_cache = _UNSET
+
+# config["base_url"], refreshed whenever the config cache is filled
+_BASE_URL = None
+
+def load_config():
+    global _config_cache, _BASE_URL
+    if _config_cache is _UNSET:
+        if CONFIG_FILE.exists():
+            _config_cache = json.loads(CONFIG_FILE.read_text())
+        else:
+            _config_cache = {}
+        _BASE_URL = _config_cache.get('base_url')
+    return _config_cache
+
+def save_config(config):
+    global _config_cache, _BASE_URL
+    ensure_config_dir()
+    CONFIG_FILE.write_text(json.dumps(config, indent=2))
+    _config_cache = config
+    _BASE_URL = config.get('base_url')
+
+def _write_private_file(path: Path, data: str):
+    """Write a file that is created with 0600 permissions from the start"""
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        if hasattr(os, 'fchmod'):
+            # The mode above only applies to new files; tighten existing ones too
+            os.fchmod(fd, 0o600)
+        os.write(fd, data.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+def load_token():
+    global _token_cache
+    if _token_cache is _UNSET:
+        if TOKEN_FILE.exists():
+            _token_cache = TOKEN_FILE.read_text().strip()
+        else:
+            _token_cache = None
+    return _token_cache
+
+def save_token(token):
+    global _token_cache
+    ensure_config_dir()
+    _write_private_file(TOKEN_FILE, token)  # Secure permissions
+    _token_cache = token.strip()
+    if _session is not None:
+        _session.headers["Authorization"] = f"Bearer {_token_cache}"
+
+def load_client_secret():
+    """Load the client secret used for cryptographic operations"""
+    global _client_secret_cache
+    if _client_secret_cache is _UNSET:
+        if CLIENT_SECRET_FILE.exists():
+            _client_secret_cache = CLIENT_SECRET_FILE.read_text().strip()
+        else:
+            _client_secret_cache = None
+    return _client_secret_cache
+
+def save_client_secret(client_secret):
+    """Save the client secret with secure permissions"""
+    global _client_secret_cache
+    ensure_config_dir()
+    _write_private_file(CLIENT_SECRET_FILE, client_secret)  # Secure permissions
+    _client_secret_cache = client_secret.strip()
+
+def generate_client_secret():
+    """Generate a new random client secret"""
+    return secrets.token_urlsafe(32)
+
+@functools.lru_cache(maxsize=4)
+def derive_topic_key_from_client_secret(client_secret: str) -> bytes:
+    """Derive a deterministic topic key from the client secret"""
+    salt = b"supercortex_flow_topic_key_derivation_v1"
+    return hmac.new(salt, client_secret.encode('utf-8'), hashlib.sha256).digest()
+
+def compute_topic_prefix(org_id: str, topic_path: str, client_secret: str) -> str:
+    """Compute the full topic prefix for watching/sharing"""
+    topic_key = derive_topic_key_from_client_secret(client_secret)
+    topic_hash_bytes, topic_nonce_bytes = _topic_hash_nonce(topic_path, topic_key)
+    return f"{org_id}{topic_hash_bytes.hex()}{topic_nonce_bytes.hex()}"
+
+def resolve_prefix_or_topic(prefix_or_topic: str) -> tuple[str, str]:
+    """
+    Resolve a prefix_or_topic string to (actual_hex_prefix, display_name)
+    Handles:
+    1. Prefix aliases (saved hex prefixes with friendly names)
+    2. Raw hex prefixes 
+    3. Topic paths (computed from org_id + client_secret)
+    
+    Returns: (hex_prefix, display_name)
+    """
+    config_data = load_config()
+    
+    # Check if it's a prefix alias first
+    prefix_aliases = config_data.get("prefix_aliases", {})
+    if prefix_or_topic in prefix_aliases:
+        hex_prefix = prefix_aliases[prefix_or_topic]
+        return hex_prefix, f"alias '{prefix_or_topic}' ({hex_prefix})"
+    
+    # Check if it's a raw hex prefix
+    if _HEX_PREFIX_RE.match(prefix_or_topic):
+        hex_prefix = prefix_or_topic.lower()
+        return hex_prefix, f"prefix {hex_prefix}"
+    
+    # Must be a topic path - compute prefix
+    org_id = config_data.get('default_org_id')
+    client_secret = load_client_secret()
+    
+    if not org_id:
+        echo("❌ No default organization set. For raw hex prefixes, use full prefix.", err=True)
+        echo("❌ For topic paths, run 'flow config create-org' first", err=True)
+        echo("❌ For saved prefixes, use 'flow config add-prefix-alias' first", err=True)
+        sys.exit(1)
+    
+    if not client_secret:
+        echo("❌ No client secret found. Run 'flow config generate-secret' first", err=True)
+        sys.exit(1)
+    
+    hex_prefix = compute_topic_prefix(org_id, prefix_or_topic, client_secret)
+    return hex_prefix, f"topic '{prefix_or_topic}'"
+
+@functools.lru_cache(maxsize=1024)
+def _topic_hash_nonce(topic_path: str, topic_key: bytes) -> tuple[bytes, bytes]:
+    """Return the 4-byte (topic_hash, topic_nonce) ID fields for a topic"""
+    topic_bytes = topic_path.encode('utf-8')
+    topic_hash_bytes = hashlib.sha256(topic_bytes).digest()[:4]
+    topic_nonce_bytes = hmac.new(topic_key, topic_bytes, hashlib.sha256).digest()[:4]
+    return topic_hash_bytes, topic_nonce_bytes
+
+def _id_prefix(org_bytes: bytes, topic_path: str = None, topic_key: bytes = None) -> str:
+    """
+    Hex-encode the fixed first 128 bits of an ID:
+    64-bit org_id + 32-bit topic_hash + 32-bit topic_nonce
+    """
+    if topic_path and topic_key:
+        topic_hash_bytes, topic_nonce_bytes = _topic_hash_nonce(topic_path, topic_key)
+    elif topic_path:
+        topic_hash_bytes = hashlib.sha256(topic_path.encode('utf-8')).digest()[:4]
+        topic_nonce_bytes = b'\x00' * 4
+    else:
+        topic_hash_bytes = topic_nonce_bytes = b'\x00' * 4
+    return (org_bytes + topic_hash_bytes + topic_nonce_bytes).hex()
+
+def _fast_id(prefix_hex: str) -> str:
+    """Append 128 random bits to a precomputed 32-char hex ID prefix"""
+    return prefix_hex + secrets.token_hex(16)
+
+def generate_256bit_id(org_id: str = None, topic_path: str = None, topic_key: bytes = None) -> str:
+    """
+    Generate a 256-bit ID with structure:
+    64-bit org_id + 32-bit topic_hash + 32-bit topic_nonce + 128-bit random
+    
+    Same logic as backend but client-controlled
+    """
+    # 64-bit org ID (8 bytes)
+    if org_id:
+        org_bytes = bytes.fromhex(org_id)
+        if len(org_bytes) != 8:
+            raise ValueError("org_id must be exactly 64 bits (8 bytes)")
+    else:
+        org_bytes = os.urandom(8)
+    
+    return _fast_id(_id_prefix(org_bytes, topic_path, topic_key))
+
+def _event_id_builder(topic_path: str = None):
+    """
+    Resolve everything in an event ID that doesn't change between events
+    (org, topic hash, topic nonce) once, and return a function that builds
+    a fresh ID. The function returns None when no org/client secret is
+    configured, leaving ID assignment to the server.
+    """
+    config_data = load_config()
+    org_id = config_data.get('default_org_id')
+    client_secret = load_client_secret()
+    
+    if not (org_id and client_secret):
+        # Fallback for backwards compatibility
+        return lambda: None
+    
+    org_bytes = bytes.fromhex(org_id)
+    if len(org_bytes) != 8:
+        raise ValueError("org_id must be exactly 64 bits (8 bytes)")
+    
+    topic_key = derive_topic_key_from_client_secret(client_secret) if topic_path else None
+    
+    # The first 128 bits never change for this org/topic, so hex-encode them once
+    prefix_hex = _id_prefix(org_bytes, topic_path, topic_key)
+    return lambda: _fast_id(prefix_hex)
+
+def _build_event_payload(message: str, topic_path: str = None, build_id=None) -> tuple[dict, str]:
+    """
+    Build the POST /events body for a message.
+    
+    build_id: ID builder from _event_id_builder(topic_path); pass one in when
+    sending many events to the same topic so it is only resolved once.
+    
+    Returns: (data, topic_info) where topic_info is the suffix for status output
+    """
+    if build_id is None:
+        build_id = _event_id_builder(topic_path)
+    
+    event_id = build_id()
+    if event_id:
+        # Generate ID client-side using config org_id
+        data = {
+            "body": message,
+            "id": event_id  # Send pre-computed ID
+        }
+    else:
+        # Fallback for backwards compatibility
+        data = {"body": message}
+        
+    if topic_path:
+        data["topic_path"] = topic_path
+    
+    topic_info = f" (topic: {topic_path})" if topic_path else ""
+    return data, topic_info
+
+def add_event_with_topic(message: str, topic_path: str = None, build_id=None):
+    """Add an event, optionally with a topic path."""
+    try:
+        data, topic_info = _build_event_payload(message, topic_path, build_id)
+        result = make_request("POST", "/events", data)
+        echo(f"✓ Event added{topic_info}: {result['id']}")
+    except Exception as e:
+        echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+# Shared HTTP session, created on first use
+_session = None
+
+def get_session():
+    """Return the shared requests.Session so connections are kept alive between requests"""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Retry covers connection failures; POSTs are never retried once sent
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        _session = requests.Session()
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+        
+        # Authenticate once here (save_token keeps it current) instead of per request
+        token = load_token()
+        if token:
+            _session.headers["Authorization"] = f"Bearer {token}"
+    return _session
+
+def make_request(method, endpoint, data=None, params=None):
+    token = load_token()
+    if not token:
+        echo("❌ Not logged in. Use 'flow login' first", err=True)
+        sys.exit(1)
+    
+    load_config()  # Fills _BASE_URL
+    session = get_session()
+    if method == "POST":
+        response = session.post(_BASE_URL + endpoint, json=data, params=params)
+    elif method == "GET":
+        response = session.get(_BASE_URL + endpoint, params=params)
+    else:
+        raise ValueError(f"Unsupported method: {method}")
+    
+    if not response.ok:
+        try:
+            error_detail = response.json().get("detail", "Unknown error")
+        except:
+            error_detail = response.text
+        raise Exception(f"HTTP {response.status_code}: {error_detail}")
+    
+    # Parse the raw bytes directly rather than via response.json()
+    return _json_loads(response.content)
+
+def watch_ws_url(base_url: str, prefix: str, token: str) -> str:
+    """
+    Build the /events/watch_ws URL for a prefix.
+    
+    The prefix is always plain hex, so only the token needs escaping.
+    """
+    from urllib.parse import quote
+    
+    # Convert HTTP URL to WebSocket URL
+    ws_url = base_url.replace('http://', 'ws://').replace('https://', 'wss://')
+    return f"{ws_url}/events/watch_ws?prefix={prefix}&token={quote(token, safe='-_.~')}"
+
+# The watch sockets only carry small JSON metadata frames: permessage-deflate
+# costs a zlib pass per frame for no real saving, and the size cap bounds
+# buffering.
+WS_CONNECT_OPTIONS = {
+    'compression': None,
+    'max_size': 65536,
+    'ping_interval': 20,
+    'ping_timeout': 10,
+}
+
+
+async def heartbeat_sender(websocket):
+    """Send periodic heartbeats to keep connection alive"""
+    import asyncio
+    import websockets
+    from datetime import datetime
+    
+    try:
+        while True:
+            await asyncio.sleep(30)  # Send heartbeat every 30 seconds
+            try:
+                await websocket.send(json.dumps({"type": "ping", "timestamp": datetime.utcnow().isoformat() + 'Z'}))
+            except websockets.exceptions.ConnectionClosed:
+                break
+    except asyncio.CancelledError:
+        pass
+
+async def nc_listen_websocket(prefix_or_topic: str):
+    """Netcat-style listen mode using WebSocket with heartbeats and auto-reconnection"""
+    import asyncio
+    import collections
+    import io
+    import aiohttp
+    import websockets
+    
+    config = load_config()
+    token = load_token()
+    
+    if not token:
+        echo("# Error: Not logged in. Use 'flow login' first", err=True)
+        sys.exit(1)
+    
+    # Resolve prefix using the new helper (just get the hex prefix)
+    prefix, _ = resolve_prefix_or_topic(prefix_or_topic)
+    
+    full_ws_url = watch_ws_url(config['base_url'], prefix, token)
+    
+    reconnect_delay = 1  # Start with 1 second, exponential backoff
+    max_reconnect_delay = 60  # Max 60 seconds between reconnect attempts
+    base_url = config['base_url']
+    
+    # Body fetches still in flight, in WebSocket arrival order
+    pending = collections.deque()
+    
+    async def fetch_event(event_id):
+        try:
+            return await _get_event(http, f"{base_url}/events/{event_id}")
+        except Exception as e:
+            echo(f"# Error fetching event {event_id}: {e}", err=True)
+            return None
+    
+    # Bodies are written through one large buffer that is flushed at most
+    # NC_FLUSH_DELAY seconds after the first unflushed event (or when it fills),
+    # instead of a write() syscall per event. Interactive output is still
+    # flushed after every event.
+    out = io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'w', closefd=False),
+                            buffer_size=NC_OUTPUT_BUFFER_SIZE)
+    write_output, flush_output = _batched_writer(
+        asyncio.get_running_loop(), out.write, out.flush,
+        batch_size=1 if sys.stdout.isatty() else None)
+    
+    def write_body(event):
+        # Output just the raw body to stdout (perfect for piping)
+        if event.get('body_format') == 'base64':
+            # Decode base64 to the original raw bytes
+            payload = binascii.a2b_base64(event['body'])
+        else:
+            # UTF-8 text (legacy format is assumed to be UTF-8 too)
+            payload = event['body'].encode('utf-8', 'surrogateescape')
+        write_output(payload + b'\n')
+    
+    def write_ready(_task=None):
+        # Write out completed fetches, keeping arrival order
+        while pending and pending[0].done():
+            event = pending.popleft().result()
+            if event is not None:
+                write_body(event)
+    
+    http = aiohttp.ClientSession(headers={"Authorization": f"Bearer {token}"})
+    try:
+        while True:
+            try:
+                async with websockets.connect(full_ws_url, **WS_CONNECT_OPTIONS) as websocket:
+                    # Reset reconnect delay on successful connection
+                    reconnect_delay = 1
+                    
+                    # Set up heartbeat task
+                    heartbeat_task = asyncio.create_task(heartbeat_sender(websocket))
+                    
+                    try:
+                        async for message in websocket:
+                            try:
+                                data = _json_loads(message)
+                                
+                                if data.get("type") == "connected":
+                                    # Silent startup for netcat-style operation
+                                    continue
+                                elif data.get("type") == "heartbeat":
+                                    # Server heartbeat - just continue
+                                    continue
+                                elif data.get("type") == "pong":
+                                    # Response to our ping - just continue
+                                    continue
+                                
+                                # For nc mode, we need to get the actual event body
+                                # The WebSocket only sends metadata, so we need to fetch the full event
+                                event_id = data['id']
+                                
+                                # Fetch in the background so the next WS message isn't
+                                # held up by this round-trip
+                                while len(pending) >= NC_LISTEN_WINDOW:
+                                    await asyncio.wait([pending[0]])
+                                    write_ready()
+                                
+                                task = asyncio.create_task(fetch_event(event_id))
+                                pending.append(task)
+                                task.add_done_callback(write_ready)
+                                
+                            except json.JSONDecodeError:
+                                echo(f"# Invalid message received", err=True)
+                            except KeyError as e:
+                                echo(f"# Missing field in message: {e}", err=True)
+                                
+                    except websockets.exceptions.ConnectionClosedError as e:
+                        echo(f"# Connection closed: {e.reason if e.reason else 'Unknown reason'}", err=True)
+                        raise  # Re-raise to trigger reconnection
+                    finally:
+                        heartbeat_task.cancel()
+                        try:
+                            await heartbeat_task
+                        except asyncio.CancelledError:
+                            pass
+                            
+            except websockets.exceptions.InvalidURI:
+                echo(f"# Invalid WebSocket URL: {full_ws_url}", err=True)
+                break
+            except KeyboardInterrupt:
+                echo("# Stopped listening", err=True)
+                break
+            except Exception as e:
+                echo(f"# Connection error: {e}", err=True)
+                
+            # Exponential backoff for reconnection
+            echo(f"# Reconnecting in {reconnect_delay} seconds...", err=True)
+            try:
+                await asyncio.sleep(reconnect_delay)
+            except KeyboardInterrupt:
+                echo("# Stopped listening", err=True)
+                break
+                
+            reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+        
+        # Let fetches already in flight finish before exiting
+        if pending:
+            await asyncio.wait(list(pending))
+            write_ready()
+    finally:
+        flush_output()
+        await http.close()
+
+def nc_listen(prefix_or_topic: str):
+    """Listen mode - stream event bodies to stdout"""
+    import asyncio
+    
+    try:
+        asyncio.run(nc_listen_websocket(prefix_or_topic))
+    except KeyboardInterrupt:
+        echo("\n# Stopped listening", err=True)
+
+# Maximum number of stdin lines nc send mode posts in one request
+NC_SEND_BATCH_SIZE = 256
+
+# Maximum number of nc listen-mode body fetches in flight at once
+NC_LISTEN_WINDOW = 64
+
+# nc listen-mode stdout buffering: buffer size, and the longest a written
+# event may wait in the buffer before a flush
+NC_OUTPUT_BUFFER_SIZE = 128 * 1024
+NC_FLUSH_DELAY = 0.05
+
+def _batched_writer(loop, write, flush, batch_size: int = None, flush_delay: float = NC_FLUSH_DELAY):
+    """
+    Wrap write() so that flush() runs after every batch_size writes (if set),
+    or flush_delay seconds after the first unflushed write. The timer is not
+    re-armed by later writes, so a busy stream still bounds output latency.
+    
+    Returns: (write, flush) - call the returned flush when output ends
+    """
+    unflushed = 0
+    timer = None
+    
+    def flush_now():
+        nonlocal unflushed, timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        unflushed = 0
+        flush()
+    
+    def batched_write(data):
+        nonlocal unflushed, timer
+        write(data)
+        unflushed += 1
+        if batch_size is not None and unflushed >= batch_size:
+            flush_now()
+        elif timer is None:
+            timer = loop.call_later(flush_delay, flush_now)
+    
+    return batched_write, flush_now
+
+async def _read_json_response(response) -> dict:
+    """Decode an aiohttp response, raising on HTTP errors like make_request()"""
+    content = await response.read()
+    
+    if response.status >= 400:
+        try:
+            error_detail = json.loads(content).get("detail", "Unknown error")
+        except:
+            error_detail = content.decode('utf-8', 'replace')
+        raise Exception(f"HTTP {response.status}: {error_detail}")
+    
+    return _json_loads(content)
+
+async def _post_event(session, url: str, data: dict) -> dict:
+    """POST an event with aiohttp"""
+    async with session.post(url, json=data) as response:
+        return await _read_json_response(response)
+
+async def _post_events(session, url: str, events: list) -> list:
+    """POST several events to /events/batch with aiohttp; returns them in order"""
+    async with session.post(url, json=events) as response:
+        return await _read_json_response(response)
+
+async def _get_event(session, url: str) -> dict:
+    """GET a full event (including body) with aiohttp"""
+    async with session.get(url) as response:
+        return await _read_json_response(response)
+
+async def _pump_stdin(topic_path: str, build_id):
+    """
+    Send stdin lines as events, in input order. Lines that arrive while a
+    request is in flight go out together in the next POST /events/batch (up
+    to NC_SEND_BATCH_SIZE), so throughput isn't limited to one line per HTTP
+    round-trip.
+    """
+    import asyncio
+    import threading
+    import aiohttp
+    
+    token = load_token()
+    base_url = load_config()['base_url']
+    
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue(maxsize=NC_SEND_BATCH_SIZE)
+    
+    def read_stdin():
+        # Blocking reads happen on a daemon thread so Ctrl+C never waits on stdin.
+        # The reader always ends the queue: with None at EOF, or with the
+        # exception that stopped it so the loop can re-raise it.
+        end = None
+        try:
+            for line in sys.stdin:
+                asyncio.run_coroutine_threadsafe(lines.put(line), loop).result()
+        except Exception as e:
+            end = e
+        finally:
+            asyncio.run_coroutine_threadsafe(lines.put(end), loop).result()
+    
+    threading.Thread(target=read_stdin, daemon=True).start()
+    
+    async def send(session, events):
+        try:
+            if len(events) == 1:
+                results = [await _post_event(session, f"{base_url}/events", events[0][0])]
+            else:
+                results = await _post_events(session, f"{base_url}/events/batch",
+                                             [data for data, _ in events])
+            for (_, topic_info), result in zip(events, results):
+                echo(f"✓ Event added{topic_info}: {result['id']}")
+        except Exception as e:
+            echo(f"# Error sending event: {e}", err=True)
+    
+    stdin_error = None
+    async with aiohttp.ClientSession(headers={"Authorization": f"Bearer {token}"}) as session:
+        ended = False
+        while not ended:
+            # Wait for one line, then take whatever else is already queued
+            queued = [await lines.get()]
+            while len(queued) < NC_SEND_BATCH_SIZE and not lines.empty():
+                queued.append(lines.get_nowait())
+            
+            events = []
+            for line in queued:
+                if line is None or isinstance(line, Exception):
+                    stdin_error = line
+                    ended = True
+                    break
+                
+                line = line.rstrip('\n\r')
+                if line:  # Skip empty lines
+                    events.append(_build_event_payload(line, topic_path, build_id))
+            
+            if events:
+                await send(session, events)
+    
+    if stdin_error is not None:
+        raise stdin_error
+
+def nc_send(prefix_or_topic: str):
+    """Send mode - read from stdin and send each line as an event"""
+    echo("# Send mode: Reading from stdin...", err=True)
+    echo("# (Ctrl+C to stop, Ctrl+D to end input)", err=True)
+    
+    # Check if this resolves to a hex prefix (can't send to those)
+    config_data = load_config()
+    prefix_aliases = config_data.get("prefix_aliases", {})
+    
+    # If it's a prefix alias or raw hex, can't send to it
+    if (prefix_or_topic in prefix_aliases or 
+        _HEX_PREFIX_RE.match(prefix_or_topic)):
+        echo("# Error: Cannot send to hex prefix or prefix alias. Use topic path instead.", err=True)
+        echo("# Hint: Use a topic path like 'logs.errors' to send events", err=True)
+        sys.exit(1)
+    
+    # Must be a topic path
+    topic_path = prefix_or_topic
+    
+    # Resolve org/topic ID fields once rather than per line
+    try:
+        build_id = _event_id_builder(topic_path)
+    except ValueError as e:
+        echo(f"# Error: {e}", err=True)
+        sys.exit(1)
+    
+    if not load_token():
+        echo("# Error: Not logged in. Use 'flow login' first", err=True)
+        sys.exit(1)
+    
+    import asyncio
+    
+    try:
+        asyncio.run(_pump_stdin(topic_path, build_id))
+    except KeyboardInterrupt:
+        echo("\n# Stopped sending", err=True)
+    except (OSError, ValueError) as e:
+        # e.g. stdin is not valid in the configured encoding
+        echo(f"# Error reading stdin: {e}", err=True)
+        sys.exit(1)
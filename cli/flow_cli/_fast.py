@@ -0,0 +1,105 @@
+"""
+Console entry point with a fast path for the hot subcommands.
+
+`flow add` and `flow nc` are typically launched many times from shell
+scripts and pipelines, where per-invocation startup is the whole workload.
+Their arguments are parsed here by hand and dispatched straight to the
+implementations in _core.py, which never imports click, so neither click
+nor the command group is loaded. Anything this parser does not recognise
+(--help, unknown options, other commands) falls through to the full Click
+CLI.
+"""
+import sys
+
+ADD_OPTIONS = {'-t': 'topic', '--topic': 'topic'}
+NC_FLAGS = {'-l': 'listen', '--listen': 'listen'}
+
+def _parse(args, options=None, flags=None):
+    """
+    Hand-parse subcommand arguments.
+
+    options maps option spellings that take a value to a destination name,
+    flags maps boolean flag spellings to a destination name.
+
+    Returns: (positionals, values), or None if Click should handle the args
+    """
+    options = options or {}
+    flags = flags or {}
+    positionals = []
+    values = {}
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--':
+            positionals.extend(args[i + 1:])
+            break
+
+        if arg.startswith('--') and '=' in arg:
+            name, value = arg.split('=', 1)
+            if name not in options:
+                return None
+            values[options[name]] = value
+        elif arg in flags:
+            values[flags[arg]] = True
+        elif arg in options:
+            i += 1
+            if i >= len(args):
+                return None
+            values[options[arg]] = args[i]
+        elif arg.startswith('-') and arg != '-':
+            # Unknown option, --help, combined short flags, ...
+            return None
+        else:
+            positionals.append(arg)
+        i += 1
+
+    return positionals, values
+
+def _run_fast(args):
+    """Run `add`/`nc` without Click. Returns False if the args need Click."""
+    command = args[0]
+
+    if command == 'add':
+        parsed = _parse(args[1:], options=ADD_OPTIONS)
+        if not parsed or len(parsed[0]) != 1:
+            return False
+        positionals, values = parsed
+
+        from ._core import add_event_with_topic
+        add_event_with_topic(positionals[0], values.get('topic'))
+        return True
+
+    if command == 'nc':
+        parsed = _parse(args[1:], flags=NC_FLAGS)
+        if not parsed or len(parsed[0]) != 1:
+            return False
+        positionals, values = parsed
+
+        from ._core import nc_listen, nc_send
+        if values.get('listen'):
+            nc_listen(positionals[0])
+        else:
+            nc_send(positionals[0])
+        return True
+
+    return False
+
+def main():
+    """Entry point for the `flow` console script"""
+    args = sys.argv[1:]
+
+    if args and args[0] in ('add', 'nc'):
+        try:
+            if _run_fast(args):
+                return
+        except KeyboardInterrupt:
+            # Same behaviour as Click's standalone mode
+            print("\nAborted!", file=sys.stderr)
+            sys.exit(1)
+
+    from .main import cli
+    cli()
+
+if __name__ == '__main__':
+    main()
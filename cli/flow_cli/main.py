@@ -1,218 +1,23 @@
 import click
 import json
 import sys
-import os
-import requests
-import time
-import base64
-import asyncio
-import websockets
-import urllib.parse
-import hashlib
-import hmac
-import secrets
-from pathlib import Path
-from datetime import datetime
 
-CONFIG_DIR = Path.home() / ".flow"
-TOKEN_FILE = CONFIG_DIR / "token"
-CONFIG_FILE = CONFIG_DIR / "config.json"
-CLIENT_SECRET_FILE = CONFIG_DIR / "client_secret"
-
-def ensure_config_dir():
-    CONFIG_DIR.mkdir(exist_ok=True)
-
-def load_config():
-    if CONFIG_FILE.exists():
-        return json.loads(CONFIG_FILE.read_text())
-    return {}
-
-def save_config(config):
-    ensure_config_dir()
-    CONFIG_FILE.write_text(json.dumps(config, indent=2))
-
-def load_token():
-    if TOKEN_FILE.exists():
-        return TOKEN_FILE.read_text().strip()
-    return None
-
-def save_token(token):
-    ensure_config_dir()
-    TOKEN_FILE.write_text(token)
-    TOKEN_FILE.chmod(0o600)  # Secure permissions
-
-def load_client_secret():
-    """Load the client secret used for cryptographic operations"""
-    if CLIENT_SECRET_FILE.exists():
-        return CLIENT_SECRET_FILE.read_text().strip()
-    return None
-
-def save_client_secret(client_secret):
-    """Save the client secret with secure permissions"""
-    ensure_config_dir()
-    CLIENT_SECRET_FILE.write_text(client_secret)
-    CLIENT_SECRET_FILE.chmod(0o600)  # Secure permissions
-
-def generate_client_secret():
-    """Generate a new random client secret"""
-    return secrets.token_urlsafe(32)
-
-def derive_topic_key_from_client_secret(client_secret: str) -> bytes:
-    """Derive a deterministic topic key from the client secret"""
-    salt = b"supercortex_flow_topic_key_derivation_v1"
-    return hmac.new(salt, client_secret.encode('utf-8'), hashlib.sha256).digest()
-
-def generate_topic_hash(topic_path: str) -> str:
-    """Generate 32-bit hash of topic path"""
-    return hashlib.sha256(topic_path.encode('utf-8')).digest()[:4].hex()
-
-def generate_topic_nonce(topic_key: bytes, topic_path: str) -> str:
-    """Generate deterministic 32-bit nonce for topic using HMAC"""
-    return hmac.new(topic_key, topic_path.encode('utf-8'), hashlib.sha256).digest()[:4].hex()
-
-def compute_topic_prefix(org_id: str, topic_path: str, client_secret: str) -> str:
-    """Compute the full topic prefix for watching/sharing"""
-    topic_key = derive_topic_key_from_client_secret(client_secret)
-    topic_hash = generate_topic_hash(topic_path)
-    topic_nonce = generate_topic_nonce(topic_key, topic_path)
-    return f"{org_id}{topic_hash}{topic_nonce}"
-
-def resolve_prefix_or_topic(prefix_or_topic: str) -> tuple[str, str]:
-    """
-    Resolve a prefix_or_topic string to (actual_hex_prefix, display_name)
-    Handles:
-    1. Prefix aliases (saved hex prefixes with friendly names)
-    2. Raw hex prefixes 
-    3. Topic paths (computed from org_id + client_secret)
-    
-    Returns: (hex_prefix, display_name)
-    """
-    config_data = load_config()
-    
-    # Check if it's a prefix alias first
-    prefix_aliases = config_data.get("prefix_aliases", {})
-    if prefix_or_topic in prefix_aliases:
-        hex_prefix = prefix_aliases[prefix_or_topic]
-        return hex_prefix, f"alias '{prefix_or_topic}' ({hex_prefix})"
-    
-    # Check if it's a raw hex prefix
-    if all(c in '0123456789abcdefABCDEF' for c in prefix_or_topic) and len(prefix_or_topic) >= 16:
-        hex_prefix = prefix_or_topic.lower()
-        return hex_prefix, f"prefix {hex_prefix}"
-    
-    # Must be a topic path - compute prefix
-    org_id = config_data.get('default_org_id')
-    client_secret = load_client_secret()
-    
-    if not org_id:
-        click.echo("❌ No default organization set. For raw hex prefixes, use full prefix.", err=True)
-        click.echo("❌ For topic paths, run 'flow config create-org' first", err=True)
-        click.echo("❌ For saved prefixes, use 'flow config add-prefix-alias' first", err=True)
-        sys.exit(1)
-    
-    if not client_secret:
-        click.echo("❌ No client secret found. Run 'flow config generate-secret' first", err=True)
-        sys.exit(1)
-    
-    hex_prefix = compute_topic_prefix(org_id, prefix_or_topic, client_secret)
-    return hex_prefix, f"topic '{prefix_or_topic}'"
-
-def generate_256bit_id(org_id: str = None, topic_path: str = None, topic_key: bytes = None) -> str:
-    """
-    Generate a 256-bit ID with structure:
-    64-bit org_id + 32-bit topic_hash + 32-bit topic_nonce + 128-bit random
-    
-    Same logic as backend but client-controlled
-    """
-    import os
-    import hashlib
-    import hmac
-    
-    # 64-bit org ID (8 bytes)
-    if org_id:
-        org_bytes = bytes.fromhex(org_id)
-        if len(org_bytes) != 8:
-            raise ValueError("org_id must be exactly 64 bits (8 bytes)")
-    else:
-        org_bytes = os.urandom(8)
-    
-    # 32-bit topic hash (4 bytes)
-    if topic_path:
-        topic_hash_bytes = hashlib.sha256(topic_path.encode('utf-8')).digest()[:4]
-    else:
-        topic_hash_bytes = b'\x00' * 4
-    
-    # 32-bit topic nonce (4 bytes)  
-    if topic_path and topic_key:
-        topic_nonce_bytes = hmac.new(topic_key, topic_path.encode('utf-8'), hashlib.sha256).digest()[:4]
-    else:
-        topic_nonce_bytes = b'\x00' * 4
-        
-    # 128-bit random (16 bytes)
-    random_bytes = os.urandom(16)
-    
-    # Combine all parts (32 bytes total = 256 bits)
-    full_id = org_bytes + topic_hash_bytes + topic_nonce_bytes + random_bytes
-    return full_id.hex()
-
-def add_event_with_topic(message: str, topic_path: str = None):
-    """Add an event, optionally with a topic path."""
-    try:
-        config_data = load_config()
-        org_id = config_data.get('default_org_id')
-        client_secret = load_client_secret()
-        
-        if org_id and client_secret:
-            # Generate ID client-side using config org_id
-            if topic_path:
-                topic_key = derive_topic_key_from_client_secret(client_secret)
-                event_id = generate_256bit_id(org_id, topic_path, topic_key)
-            else:
-                event_id = generate_256bit_id(org_id)
-            
-            data = {
-                "body": message,
-                "id": event_id  # Send pre-computed ID
-            }
-        else:
-            # Fallback for backwards compatibility
-            data = {"body": message}
-            
-        if topic_path:
-            data["topic_path"] = topic_path
-            
-        result = make_request("POST", "/events", data)
-        topic_info = f" (topic: {topic_path})" if topic_path else ""
-        click.echo(f"✓ Event added{topic_info}: {result['id']}")
-    except Exception as e:
-        click.echo(f"❌ Error: {e}", err=True)
-        sys.exit(1)
-
-def make_request(method, endpoint, data=None, params=None):
-    token = load_token()
-    if not token:
-        click.echo("❌ Not logged in. Use 'flow login' first", err=True)
-        sys.exit(1)
-    
-    config = load_config()
-    url = f"{config['base_url']}{endpoint}"
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    if method == "POST":
-        response = requests.post(url, json=data, headers=headers, params=params)
-    elif method == "GET":
-        response = requests.get(url, headers=headers, params=params)
-    else:
-        raise ValueError(f"Unsupported method: {method}")
-    
-    if not response.ok:
-        try:
-            error_detail = response.json().get("detail", "Unknown error")
-        except:
-            error_detail = response.text
-        raise Exception(f"HTTP {response.status_code}: {error_detail}")
-    
-    return response.json()
+# The add/nc implementations and the helpers they share live in _core, which
+# does not import click so the fast entry point can use them directly. Names
+# not used below are re-exported for code that imports them from here.
+# _json_loads rebinds itself inside _core on first use, so it is always
+# called through the module rather than imported by name.
+from . import _core
+from ._core import (
+    CONFIG_DIR, TOKEN_FILE, CONFIG_FILE, CLIENT_SECRET_FILE, WS_CONNECT_OPTIONS,
+    _HEX_PREFIX_RE, _batched_writer, ensure_config_dir,
+    load_config, save_config, load_token, save_token,
+    load_client_secret, save_client_secret, generate_client_secret,
+    derive_topic_key_from_client_secret,
+    compute_topic_prefix, resolve_prefix_or_topic, generate_256bit_id,
+    add_event_with_topic, get_session, make_request,
+    watch_ws_url, heartbeat_sender, nc_listen, nc_send,
+)
 
 @click.group(invoke_without_command=True)
 @click.pass_context
@@ -379,6 +184,8 @@ def generate_secret():
 @click.option('--output', '-o', help='Output file (default: stdout)')
 def export_secret(output):
     """Export client secret for sharing with other client instances"""
+    from datetime import datetime
+    
     client_secret = load_client_secret()
     
     if not client_secret:
@@ -652,6 +459,9 @@ def share_topic(topic_path, copy):
 
 async def watch_with_websocket(prefix_or_topic: str):
     """Watch for events using WebSocket connection with heartbeats and auto-reconnection"""
+    import asyncio
+    import websockets
+    
     config = load_config()
     token = load_token()
     
@@ -662,25 +472,29 @@ async def watch_with_websocket(prefix_or_topic: str):
     # Resolve prefix using the new helper
     prefix, display_name = resolve_prefix_or_topic(prefix_or_topic)
     
-    # Convert HTTP URL to WebSocket URL
-    ws_url = config['base_url'].replace('http://', 'ws://').replace('https://', 'wss://')
-    
-    # Build WebSocket URL with query parameters
-    query_params = urllib.parse.urlencode({
-        'prefix': prefix,
-        'token': token
-    })
-    full_ws_url = f"{ws_url}/events/watch_ws?{query_params}"
+    full_ws_url = watch_ws_url(config['base_url'], prefix, token)
     
     click.echo(f"👀 Watching for events on {display_name}")
     click.echo("   Connecting via WebSocket with auto-reconnection... (Ctrl+C to stop)")
     
+    # Event lines are the hot path, so skip click.echo's per-call overhead
+    # outside Windows. A tty is line-buffered already; a pipe is block-buffered
+    # and gets batched flushes so lines still show up promptly.
+    if sys.platform == 'win32':
+        write_event = click.echo
+    elif sys.stdout.isatty():
+        write_event = lambda line: sys.stdout.write(line + "\n")
+    else:
+        write_event, _ = _batched_writer(asyncio.get_running_loop(),
+                                         lambda line: sys.stdout.write(line + "\n"),
+                                         sys.stdout.flush, batch_size=16)
+    
     reconnect_delay = 1  # Start with 1 second, exponential backoff
     max_reconnect_delay = 60  # Max 60 seconds between reconnect attempts
     
     while True:
         try:
-            async with websockets.connect(full_ws_url, ping_interval=20, ping_timeout=10) as websocket:
+            async with websockets.connect(full_ws_url, **WS_CONNECT_OPTIONS) as websocket:
                 # Reset reconnect delay on successful connection
                 reconnect_delay = 1
                 
@@ -690,7 +504,7 @@ async def watch_with_websocket(prefix_or_topic: str):
                 try:
                     async for message in websocket:
                         try:
-                            data = json.loads(message)
+                            data = _core._json_loads(message)
                             
                             if data.get("type") == "connected":
                                 click.echo(f"   ✓ Connected! Using prefix: {data['prefix_used']}")
@@ -708,7 +522,7 @@ async def watch_with_websocket(prefix_or_topic: str):
                             body_length = data['body_length']
                             event_id = data['id']
                             
-                            click.echo(f"🔴 {event_time} | {agent_id} | {body_length} bytes | {event_id}")
+                            write_event(f"🔴 {event_time} | {agent_id} | {body_length} bytes | {event_id}")
                             
                         except json.JSONDecodeError:
                             click.echo(f"❌ Invalid message received: {message}", err=True)
@@ -744,23 +558,12 @@ async def watch_with_websocket(prefix_or_topic: str):
             
         reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
 
-async def heartbeat_sender(websocket):
-    """Send periodic heartbeats to keep connection alive"""
-    try:
-        while True:
-            await asyncio.sleep(30)  # Send heartbeat every 30 seconds
-            try:
-                await websocket.send(json.dumps({"type": "ping", "timestamp": datetime.utcnow().isoformat() + 'Z'}))
-            except websockets.exceptions.ConnectionClosed:
-                break
-    except asyncio.CancelledError:
-        pass
-
 @cli.command()
 @click.argument('prefix_or_topic', required=True)
 @click.option('--poll', is_flag=True, help='Use polling instead of WebSocket (fallback mode)')
 def watch(prefix_or_topic, poll):
     """Watch for new events (topic path or hex prefix)"""
+    import asyncio
     
     if poll:
         # Use the old polling method as fallback
@@ -772,8 +575,15 @@ def watch(prefix_or_topic, poll):
         except KeyboardInterrupt:
             click.echo("\n👋 Stopped watching")
 
+# Polling watch interval bounds (seconds)
+POLL_INTERVAL_MIN = 0.25
+POLL_INTERVAL_MAX = 5.0
+
 def watch_with_polling(prefix_or_topic: str):
     """Original polling implementation (kept as fallback)"""
+    import time
+    from datetime import datetime
+    
     config = load_config()
     token = load_token()
     
@@ -784,6 +594,7 @@ def watch_with_polling(prefix_or_topic: str):
     click.echo("   (Ctrl+C to stop)")
     
     last_timestamp = None
+    interval = POLL_INTERVAL_MIN
     try:
         while True:
             try:
@@ -802,24 +613,22 @@ def watch_with_polling(prefix_or_topic: str):
                 
                 events = result['events']
                 
-                # Process events in reverse order (oldest first)
+                # Process events in reverse order (oldest first). Any event not
+                # newer than last_timestamp is skipped, so after this single pass
+                # last_timestamp is already the latest timestamp in the batch.
                 for event in reversed(events):
                     event_time = event['timestamp']
                     if last_timestamp is None or event_time > last_timestamp:
                         click.echo(f"🔴 {event_time} | {event['agent_id']} | {event['body_length']} bytes | {event['id']}")
                         last_timestamp = event_time
                 
-                # Update timestamp even if no matching events found
-                if events:
-                    all_timestamps = [event['timestamp'] for event in events]
-                    latest = max(all_timestamps)
-                    if last_timestamp is None or latest > last_timestamp:
-                        last_timestamp = latest
-                elif last_timestamp is None:
-                    # First run, set timestamp to now
+                if last_timestamp is None:
+                    # First run with no events, set timestamp to now
                     last_timestamp = datetime.utcnow().isoformat() + 'Z'
                 
-                time.sleep(1)  # Poll every second
+                # Poll quickly while events are arriving, back off while idle
+                interval = POLL_INTERVAL_MIN if events else min(interval * 2, POLL_INTERVAL_MAX)
+                time.sleep(interval)
                 
             except KeyboardInterrupt:
                 click.echo("\n👋 Stopped watching")
@@ -831,115 +640,6 @@ def watch_with_polling(prefix_or_topic: str):
     except KeyboardInterrupt:
         click.echo("\n👋 Stopped watching")
 
-async def nc_listen_websocket(prefix_or_topic: str):
-    """Netcat-style listen mode using WebSocket with heartbeats and auto-reconnection"""
-    config = load_config()
-    token = load_token()
-    
-    if not token:
-        click.echo("# Error: Not logged in. Use 'flow login' first", err=True)
-        sys.exit(1)
-    
-    # Resolve prefix using the new helper (just get the hex prefix)
-    prefix, _ = resolve_prefix_or_topic(prefix_or_topic)
-    
-    # Convert HTTP URL to WebSocket URL
-    ws_url = config['base_url'].replace('http://', 'ws://').replace('https://', 'wss://')
-    
-    # Build WebSocket URL with query parameters
-    query_params = urllib.parse.urlencode({
-        'prefix': prefix,
-        'token': token
-    })
-    full_ws_url = f"{ws_url}/events/watch_ws?{query_params}"
-    
-    reconnect_delay = 1  # Start with 1 second, exponential backoff
-    max_reconnect_delay = 60  # Max 60 seconds between reconnect attempts
-    
-    while True:
-        try:
-            async with websockets.connect(full_ws_url, ping_interval=20, ping_timeout=10) as websocket:
-                # Reset reconnect delay on successful connection
-                reconnect_delay = 1
-                
-                # Set up heartbeat task
-                heartbeat_task = asyncio.create_task(heartbeat_sender(websocket))
-                
-                try:
-                    async for message in websocket:
-                        try:
-                            data = json.loads(message)
-                            
-                            if data.get("type") == "connected":
-                                # Silent startup for netcat-style operation
-                                continue
-                            elif data.get("type") == "heartbeat":
-                                # Server heartbeat - just continue
-                                continue
-                            elif data.get("type") == "pong":
-                                # Response to our ping - just continue
-                                continue
-                            
-                            # For nc mode, we need to get the actual event body
-                            # The WebSocket only sends metadata, so we need to fetch the full event
-                            event_id = data['id']
-                            
-                            # Fetch the full event to get the body
-                            try:
-                                event = make_request("GET", f"/events/{event_id}")
-                                
-                                # Output just the raw body to stdout (perfect for piping)
-                                if event.get('body_format') == 'utf8':
-                                    print(event['body'])
-                                elif event.get('body_format') == 'base64':
-                                    # Decode base64 and output raw bytes
-                                    import base64
-                                    raw_bytes = base64.b64decode(event['body'])
-                                    sys.stdout.buffer.write(raw_bytes)
-                                    sys.stdout.buffer.write(b'\n')
-                                else:
-                                    # Legacy format - assume UTF-8
-                                    print(event['body'])
-                                    
-                                sys.stdout.flush()
-                                
-                            except Exception as e:
-                                click.echo(f"# Error fetching event {event_id}: {e}", err=True)
-                            
-                        except json.JSONDecodeError:
-                            click.echo(f"# Invalid message received", err=True)
-                        except KeyError as e:
-                            click.echo(f"# Missing field in message: {e}", err=True)
-                            
-                except websockets.exceptions.ConnectionClosedError as e:
-                    click.echo(f"# Connection closed: {e.reason if e.reason else 'Unknown reason'}", err=True)
-                    raise  # Re-raise to trigger reconnection
-                finally:
-                    heartbeat_task.cancel()
-                    try:
-                        await heartbeat_task
-                    except asyncio.CancelledError:
-                        pass
-                        
-        except websockets.exceptions.InvalidURI:
-            click.echo(f"# Invalid WebSocket URL: {full_ws_url}", err=True)
-            break
-        except KeyboardInterrupt:
-            click.echo("# Stopped listening", err=True)
-            break
-        except Exception as e:
-            click.echo(f"# Connection error: {e}", err=True)
-            
-        # Exponential backoff for reconnection
-        click.echo(f"# Reconnecting in {reconnect_delay} seconds...", err=True)
-        try:
-            await asyncio.sleep(reconnect_delay)
-        except KeyboardInterrupt:
-            click.echo("# Stopped listening", err=True)
-            break
-            
-        reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
-
 @cli.command()
 @click.argument('prefix_or_topic', required=True)
 @click.option('-l', '--listen', is_flag=True, help='Listen mode - stream event bodies to stdout (netcat-style)')
@@ -947,42 +647,9 @@ def nc(prefix_or_topic, listen):
     """Netcat-style event streaming - raw bodies for scripting/piping"""
     
     if listen:
-        # Listen mode - stream events to stdout
-        try:
-            asyncio.run(nc_listen_websocket(prefix_or_topic))
-        except KeyboardInterrupt:
-            click.echo("\n# Stopped listening", err=True)
+        nc_listen(prefix_or_topic)
     else:
-        # Send mode - read from stdin and send as events
-        click.echo("# Send mode: Reading from stdin...", err=True)
-        click.echo("# (Ctrl+C to stop, Ctrl+D to end input)", err=True)
-        
-        # Check if this resolves to a hex prefix (can't send to those)
-        config_data = load_config()
-        prefix_aliases = config_data.get("prefix_aliases", {})
-        
-        # If it's a prefix alias or raw hex, can't send to it
-        if (prefix_or_topic in prefix_aliases or 
-            (all(c in '0123456789abcdefABCDEF' for c in prefix_or_topic) and len(prefix_or_topic) >= 16)):
-            click.echo("# Error: Cannot send to hex prefix or prefix alias. Use topic path instead.", err=True)
-            click.echo("# Hint: Use a topic path like 'logs.errors' to send events", err=True)
-            sys.exit(1)
-        
-        # Must be a topic path
-        topic_path = prefix_or_topic
-        
-        try:
-            for line in sys.stdin:
-                line = line.rstrip('\n\r')
-                if line:  # Skip empty lines
-                    try:
-                        add_event_with_topic(line, topic_path)
-                    except Exception as e:
-                        click.echo(f"# Error sending event: {e}", err=True)
-        except KeyboardInterrupt:
-            click.echo("\n# Stopped sending", err=True)
-        except EOFError:
-            click.echo("# End of input", err=True)
+        nc_send(prefix_or_topic)
 
 @cli.command()
 @click.argument('prefix_or_topic', required=True)
@@ -1004,7 +671,7 @@ def history(prefix_or_topic, since, limit, full):
     # If since is provided and looks like a message ID (hex), convert it to a timestamp
     since_param = None
     if since:
-        if all(c in '0123456789abcdefABCDEF' for c in since) and len(since) == 64:
+        if len(since) == 64 and _HEX_PREFIX_RE.match(since):
             # It's a message ID - get that event's timestamp
             try:
                 event = make_request("GET", f"/events/{since}")
@@ -1074,4 +741,4 @@ def history(prefix_or_topic, since, limit, full):
         sys.exit(1)
 
 if __name__ == '__main__':
-    cli() 
\ No newline at end of file
+    cli() 
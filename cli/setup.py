@@ -42,10 +42,14 @@ setup(
         "click>=8.1.0",
         "requests>=2.31.0",
         "websockets>=12.0",
+        "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.8.0"],
+    },
     entry_points={
         "console_scripts": [
-            "flow=flow_cli.main:cli",
+            "flow=flow_cli._fast:main",
         ],
     },
     python_requires=">=3.8",
@@ -115,9 +115,8 @@ def sync_example():
         watcher = topic.watch(callback=handle_event)
         watcher.start()
         
-        # Do other work...
-        import time
-        time.sleep(5)
+        # Do other work, or wait up to 5 seconds for the watcher
+        watcher.join(5)
         
         watcher.stop()
 
@@ -162,10 +161,9 @@ def context_manager_example():
     def handle_error(event):
         print(f"Error event: {event.body}")
     
-    with client.watch_topic("logs.errors", callback=handle_error):
+    with client.watch_topic("logs.errors", callback=handle_error) as watcher:
         print("Watching for 5 seconds...")
-        import time
-        time.sleep(5)
+        watcher.join(5)
     
     print("Stopped watching")
 
@@ -240,4 +238,7 @@ if __name__ == "__main__":
     try:
         asyncio.run(async_example())
     except Exception as e:
-        print(f"Async example failed: {e}") 
\ No newline at end of file
+        print(f"Async example failed: {e}")
+    
+    # All the clients above share one connection pool per server
+    FlowClient.close_all() 
\ No newline at end of file
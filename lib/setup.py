@@ -9,5 +9,8 @@ setup(
         "websockets>=12.0",
         "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.8.0"],
+    },
     python_requires=">=3.8",
 ) 
\ No newline at end of file
@@ -11,8 +11,43 @@ This will listen for temperature sensor events in real-time.
 """
 
 import asyncio
+import sys
 from supercortex_flow import FlowClient, FlowError, FlowAuthError, FlowConnectionError
 
+# Output is written in batches: every BATCH_EVENTS events or BATCH_DELAY seconds
+BATCH_EVENTS = 64
+BATCH_DELAY = 0.01
+
+def batched_stdout_writer(loop):
+    """
+    Return (write, flush) for event bodies on stdout. Lines are collected and
+    written to the binary stdout buffer once per batch instead of a print per
+    event; the buffer retries short writes, so no body is dropped.
+    """
+    out = sys.stdout.buffer
+    lines = []
+    flush_timer = None
+    
+    def flush():
+        nonlocal flush_timer
+        if flush_timer is not None:
+            flush_timer.cancel()
+            flush_timer = None
+        if lines:
+            out.writelines(lines)
+            out.flush()
+            lines.clear()
+    
+    def write(body):
+        nonlocal flush_timer
+        lines.append(body.encode('utf-8') + b'\n')
+        if len(lines) >= BATCH_EVENTS:
+            flush()
+        elif flush_timer is None:
+            flush_timer = loop.call_later(BATCH_DELAY, flush)
+    
+    return write, flush
+
 async def temperature_listener():
     """Listen to temperature sensor events (equivalent to flow nc -l sensors.temperature)"""
     print("🌡️  Temperature Sensor Listener")
@@ -20,16 +55,23 @@ async def temperature_listener():
     print("Listening for temperature events...")
     print("(Press Ctrl+C to stop)")
     print()
+    sys.stdout.flush()  # Event bodies bypass the print buffer
+    
+    write_body, flush_output = batched_stdout_writer(asyncio.get_running_loop())
     
     try:
         # Load from default config (~/.flow/)
-        client = FlowClient.from_config()
+        client = await FlowClient.from_config_async()
         
         async with client:
-            # Stream temperature readings in real-time
-            async for event in client.stream_topic("sensors.temperature"):
-                # Just print the event body (like nc -l does)
-                print(event.body)
+            try:
+                # Stream temperature readings in real-time
+                async for event in client.stream_topic("sensors.temperature"):
+                    # Just output the event body (like nc -l does)
+                    write_body(event.body)
+            finally:
+                # Pending events go out before any error message below
+                flush_output()
                 
     except FlowAuthError:
         print("❌ Authentication failed!")
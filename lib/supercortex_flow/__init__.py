@@ -2,16 +2,108 @@ import requests
 import asyncio
 import websockets
 import json
+import os
 import hashlib
 import hmac
+import re
 import secrets
 import urllib.parse
 from typing import Optional, Dict, List, Callable, AsyncGenerator, Any, Union
 from datetime import datetime
 import threading
+import concurrent.futures
 import time
 from pathlib import Path
 import aiohttp
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup (pip install supercortex-flow[fast])
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+# Characters that force escaping inside a JSON string literal
+_JSON_ESCAPE_RE = re.compile(r'["\\\x00-\x1f]')
+_JSON_ESCAPE_BYTES_RE = re.compile(rb'["\\\x00-\x1f]')
+
+
+def _json_str(value: Union[str, bytes]) -> bytes:
+    """Encode a str, or UTF-8 bytes, as a JSON string literal"""
+    if isinstance(value, (bytes, bytearray)):
+        if value.isascii() and not _JSON_ESCAPE_BYTES_RE.search(value):
+            # Already valid inside a JSON string: pass the bytes through as-is
+            return b'"' + value + b'"'
+        value = value.decode('utf-8')
+    if value.isascii() and not _JSON_ESCAPE_RE.search(value):
+        # Nothing to escape, so quote the bytes as they are
+        return b'"' + value.encode('ascii') + b'"'
+    return _dumps(value)
+
+
+def _event_payload(body: Union[str, bytes], topic: Optional[str] = None) -> bytes:
+    """Encode a POST /events body from its fixed-shape template"""
+    payload = b'{"body":' + _json_str(body)
+    if topic:
+        payload += b',"topic_path":' + _json_str(topic)
+    return payload + b'}'
+
+
+# send_event retry delays (seconds) after failing to connect
+_BACKOFFS = tuple(0.05 * 2 ** i for i in range(6))
+
+
+def _never_sent(error: requests.exceptions.ConnectionError) -> bool:
+    """True if error happened while connecting, before any request bytes were sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+# Raw hex prefixes are at least 64 bits (the org ID)
+_HEX_PREFIX_RE = re.compile(r'[0-9a-fA-F]{16,}\Z')
+
+# Connection pool settings for the async (aiohttp) transport
+AIOHTTP_POOL_LIMIT = 32
+AIOHTTP_KEEPALIVE_TIMEOUT = 30
+
+# stream_topic() WebSocket settings. The server pushes small JSON metadata
+# frames, so per-frame compression costs more than it saves.
+WS_CONNECT_OPTIONS = {
+    'compression': None,
+    'max_size': 65536,
+    'ping_interval': 20,
+    'ping_timeout': 10,
+}
+
+# queue_event() coalescing: events are posted together after BATCH_WINDOW
+# seconds, or as soon as BATCH_MAX_EVENTS are waiting
+BATCH_WINDOW = 0.005
+BATCH_MAX_EVENTS = 256
+
+
+# requests sessions shared by every FlowClient talking to the same server,
+# so new clients reuse already-open keepalive connections
+_SESSION_POOL: Dict[str, requests.Session] = {}
+_SESSION_POOL_LOCK = threading.Lock()
+
+
+def _shared_session(base_url: str) -> requests.Session:
+    """Return the pooled requests.Session for base_url, creating it on first use"""
+    with _SESSION_POOL_LOCK:
+        session = _SESSION_POOL.get(base_url)
+        if session is None:
+            session = _SESSION_POOL[base_url] = requests.Session()
+        return session
 
 
 class FlowError(Exception):
@@ -29,9 +121,55 @@ class FlowConnectionError(FlowError):
     pass
 
 
+# FlowConfig.load() results keyed by absolute config file path, stored with
+# the (mtime_ns, size) stamps of the config, token and client secret files.
+# abspath is pure string work, unlike realpath's lstat per component; two
+# paths to the same file just get separate entries, each validated by stamp.
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+
+# Whether config files can be opened relative to a directory file descriptor
+_DIR_FD_SUPPORTED = (
+    hasattr(os, 'O_DIRECTORY')
+    and os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+
+
+def _open_dir(directory: Path) -> Optional[int]:
+    """Open directory for dir_fd lookups, or return None to use plain paths"""
+    if not _DIR_FD_SUPPORTED:
+        return None
+    try:
+        return os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return None
+
+
+def _file_stamp(path: Path, dir_fd: Optional[int] = None) -> Optional[tuple]:
+    """Return (st_mtime_ns, st_size) for path, or None if it does not exist
+    
+    With dir_fd, path is looked up by name inside that directory.
+    """
+    try:
+        st = os.stat(path.name if dir_fd is not None else path, dir_fd=dir_fd)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_file(path: Path, dir_fd: Optional[int] = None) -> bytes:
+    """Read path, looked up by name inside dir_fd if given"""
+    fd = os.open(path.name if dir_fd is not None else path, os.O_RDONLY, dir_fd=dir_fd)
+    with os.fdopen(fd, 'rb') as f:
+        return f.read()
+
+
 class FlowConfig:
     """Configuration management for Flow client"""
     
+    __slots__ = ("server", "token", "org_id", "client_secret", "org_aliases", "prefix_aliases")
+    
     # Standard config locations (same as CLI)
     DEFAULT_CONFIG_DIR = Path.home() / ".flow"
     DEFAULT_CONFIG_FILE = DEFAULT_CONFIG_DIR / "config.json"
@@ -50,43 +188,68 @@ class FlowConfig:
     def load(cls, config_path: str = None):
         """Load configuration from standard locations or custom path
         
+        Results are cached per config file and reused until the config, token
+        or client secret file changes on disk.
+        
         Args:
             config_path: Optional custom path to config file. If None, uses standard location.
         
         Returns:
             FlowConfig instance with loaded configuration
         """
-        config = cls()
-        
         if config_path:
-            # Load from custom path
-            config_file = Path(config_path)
-            if config_file.exists():
-                config_data = json.loads(config_file.read_text())
-                config._apply_config_data(config_data)
-            
             # For custom path, assume token and secret are in same directory
+            config_file = Path(config_path)
             config_dir = config_file.parent
             token_file = config_dir / "token"
             secret_file = config_dir / "client_secret"
         else:
-            # Load from standard locations
+            # Standard locations
             config_file = cls.DEFAULT_CONFIG_FILE
             token_file = cls.DEFAULT_TOKEN_FILE
             secret_file = cls.DEFAULT_CLIENT_SECRET_FILE
-            
-            if config_file.exists():
-                config_data = json.loads(config_file.read_text())
-                config._apply_config_data(config_data)
         
-        # Load token
-        if token_file.exists():
-            config.token = token_file.read_text().strip()
+        # Resolve the shared directory once and look the files up inside it
+        dir_fd = None
+        if config_file.parent == token_file.parent == secret_file.parent:
+            dir_fd = _open_dir(config_file.parent)
         
-        # Load client secret
-        if secret_file.exists():
-            config.client_secret = secret_file.read_text().strip()
+        try:
+            cache_key = os.path.abspath(config_file)
+            stamp = (
+                _file_stamp(config_file, dir_fd),
+                _file_stamp(token_file, dir_fd),
+                _file_stamp(secret_file, dir_fd)
+            )
+            cached = _CONFIG_CACHE.get(cache_key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1].copy()
+            
+            config = cls()
+            
+            if stamp[0] is not None:
+                config_data = _loads(_read_file(config_file, dir_fd))
+                config._apply_config_data(config_data)
+            
+            # Load token
+            if stamp[1] is not None:
+                config.token = _read_file(token_file, dir_fd).decode('utf-8').strip()
+            
+            # Load client secret
+            if stamp[2] is not None:
+                config.client_secret = _read_file(secret_file, dir_fd).decode('utf-8').strip()
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
         
+        _CONFIG_CACHE[cache_key] = (stamp, config.copy())
+        return config
+    
+    def copy(self) -> 'FlowConfig':
+        """Return a copy that does not share alias dicts with this config"""
+        config = FlowConfig(self.server, self.token, self.org_id, self.client_secret)
+        config.org_aliases = dict(self.org_aliases)
+        config.prefix_aliases = dict(self.prefix_aliases)
         return config
     
     def _apply_config_data(self, config_data: dict):
@@ -115,6 +278,7 @@ class FlowConfig:
         
         # Ensure directory exists
         config_dir.mkdir(exist_ok=True)
+        _CONFIG_CACHE.pop(os.path.abspath(config_file), None)
         
         # Save main config
         config_data = {
@@ -127,7 +291,10 @@ class FlowConfig:
         # Remove None values
         config_data = {k: v for k, v in config_data.items() if v is not None}
         
-        config_file.write_text(json.dumps(config_data, indent=2))
+        if orjson is not None:
+            config_file.write_bytes(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+        else:
+            config_file.write_text(json.dumps(config_data, indent=2))
         
         # Save token with secure permissions
         if self.token:
@@ -159,23 +326,61 @@ class FlowConfig:
 class FlowEvent:
     """Represents a Flow event"""
     
+    __slots__ = ("id", "body", "timestamp", "agent_id", "body_length")
+    
     def __init__(self, id: str, body: str, timestamp: str, agent_id: str, body_length: int = None):
         self.id = id
         self.body = body
         self.timestamp = timestamp
         self.agent_id = agent_id
         self.body_length = body_length or len(body)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FlowEvent':
+        """Build an event from a server JSON object (history entries may omit the body)"""
+        body = data.get("body", "")
+        return cls(data["id"], body, data["timestamp"], data["agent_id"], data.get("body_length"))
+
+
+# Event loop that runs every sync-callback watcher in the process, on one
+# daemon thread, instead of a thread and loop per watcher
+_WATCH_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_WATCH_LOOP_LOCK = threading.Lock()
+
+
+def _watch_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared watcher event loop, starting its thread on first use"""
+    global _WATCH_LOOP
+    with _WATCH_LOOP_LOCK:
+        if _WATCH_LOOP is None:
+            _WATCH_LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_WATCH_LOOP.run_forever, name="flow-watchers", daemon=True).start()
+        return _WATCH_LOOP
+
+
+def _on_watch_loop() -> bool:
+    """True when called from the shared watcher loop's own thread"""
+    try:
+        return asyncio.get_running_loop() is _WATCH_LOOP
+    except RuntimeError:
+        return False
 
 
 class TopicWatcher:
     """Manages watching a specific topic"""
     
-    def __init__(self, client: 'FlowClient', topic_or_prefix: str, callback: Callable[[FlowEvent], None] = None):
+    def __init__(self, client: 'FlowClient', topic_or_prefix: str, callback: Callable[[FlowEvent], None] = None,
+                 callback_batch: Callable[[List[FlowEvent]], None] = None, batch_size: int = 64,
+                 batch_timeout_ms: int = 10):
         self.client = client
         self.topic_or_prefix = topic_or_prefix
         self.callback = callback
+        self.callback_batch = callback_batch
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
         self._running = False
         self._task = None
+        self._finished = threading.Event()
     
     def start(self):
         """Start watching (non-blocking)"""
@@ -183,22 +388,61 @@ class TopicWatcher:
             return
         
         self._running = True
-        if asyncio.iscoroutinefunction(self.callback):
+        self._finished.clear()
+        if asyncio.iscoroutinefunction(self.callback or self.callback_batch):
             # Async callback
             self._task = asyncio.create_task(self._watch_async())
         else:
-            # Sync callback, run in thread
-            self._task = threading.Thread(target=self._watch_sync)
-            self._task.start()
+            # Sync callback, run on the shared background event loop
+            self._task = self.client._run_on_watch_loop(self._watch_async())
+        self._task.add_done_callback(lambda _: self._finished.set())
     
     def stop(self):
         """Stop watching"""
         self._running = False
         if self._task:
-            if isinstance(self._task, threading.Thread):
-                self._task.join()
-            else:
-                self._task.cancel()
+            # Cancels the stream task even while it is waiting for the next event
+            self._task.cancel()
+        self._finished.set()
+    
+    def join(self, timeout: float = None) -> bool:
+        """Block until the watcher stops or its stream ends
+        
+        For sync callers only: blocking inside an event loop would stop that
+        loop from ever finishing the watcher, so use join_async() there.
+        
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+        
+        Returns:
+            True if the watcher has finished, False if the timeout expired
+        
+        Raises:
+            RuntimeError: If called from a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._finished.wait(timeout)
+        raise RuntimeError("TopicWatcher.join() cannot be called from a running event loop; "
+                           "use 'await watcher.join_async()'")
+    
+    async def join_async(self, timeout: float = None) -> bool:
+        """Wait until the watcher stops or its stream ends (async)
+        
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+        
+        Returns:
+            True if the watcher has finished, False if the timeout expired
+        """
+        if self._finished.is_set() or self._task is None:
+            return self._finished.is_set()
+        
+        # Sync watchers run on the shared loop as a concurrent future
+        task = self._task if isinstance(self._task, asyncio.Future) else asyncio.wrap_future(self._task)
+        done, _ = await asyncio.wait([task], timeout=timeout)
+        return bool(done)
     
     def __enter__(self):
         self.start()
@@ -209,25 +453,72 @@ class TopicWatcher:
     
     async def _watch_async(self):
         """Async watching implementation"""
-        async for event in self.client.stream_topic(self.topic_or_prefix):
-            if not self._running:
-                break
-            if self.callback:
-                if asyncio.iscoroutinefunction(self.callback):
-                    await self.callback(event)
-                else:
+        if self.callback_batch:
+            await self._watch_batched()
+            return
+        
+        if asyncio.iscoroutinefunction(self.callback):
+            async for event in self.client.stream_topic(self.topic_or_prefix):
+                if not self._running:
+                    break
+                await self.callback(event)
+        else:
+            async for event in self.client.stream_topic(self.topic_or_prefix):
+                if not self._running:
+                    break
+                if self.callback:
                     self.callback(event)
     
-    def _watch_sync(self):
-        """Sync watching implementation"""
-        # Run async generator in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    async def _watch_batched(self):
+        """Hand callback_batch lists of up to batch_size events
+        
+        A partial batch is delivered batch_timeout_ms after its first event.
+        Batches are handed to callback_batch one at a time, in order, by a
+        separate delivery task so an async callback never holds up the stream.
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        flush_timer = None
+        ready = asyncio.Queue()
+        
+        def flush():
+            nonlocal batch, flush_timer
+            if flush_timer is not None:
+                flush_timer.cancel()
+                flush_timer = None
+            if batch:
+                events, batch = batch, []
+                ready.put_nowait(events)
+        
+        async def deliver_batches():
+            is_async = asyncio.iscoroutinefunction(self.callback_batch)
+            while True:
+                events = await ready.get()
+                if events is None:
+                    return
+                if is_async:
+                    await self.callback_batch(events)
+                else:
+                    self.callback_batch(events)
+        
+        delivery = asyncio.ensure_future(deliver_batches())
         try:
-            loop.run_until_complete(self._watch_async())
+            async for event in self.client.stream_topic(self.topic_or_prefix):
+                if not self._running:
+                    break
+                if delivery.done():
+                    delivery.result()  # Re-raise a failed callback
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    flush()
+                elif flush_timer is None:
+                    flush_timer = loop.call_later(self.batch_timeout_ms / 1000, flush)
         finally:
-            loop.close()
-
+            # Hand over the partial batch and let queued batches finish
+            flush()
+            ready.put_nowait(None)
+            await delivery
+    
 
 class Topic:
     """Convenience wrapper for topic operations"""
@@ -236,11 +527,15 @@ class Topic:
         self.client = client
         self.topic_path = topic_path
     
-    def send(self, body: str) -> str:
+    def send(self, body: Union[str, bytes]) -> str:
         """Send event to this topic (sync)"""
         return self.client.send_event(body, topic=self.topic_path)
     
-    async def send_async(self, body: str) -> str:
+    def queue(self, body: str):
+        """Queue event for this topic to be sent in a batch (sync)"""
+        self.client.queue_event(body, topic=self.topic_path)
+    
+    async def send_async(self, body: Union[str, bytes]) -> str:
         """Send event to this topic (async)"""
         return await self.client.send_event_async(body, topic=self.topic_path)
     
@@ -252,9 +547,9 @@ class Topic:
         """Get topic history (async)"""
         return await self.client.get_history_async(self.topic_path, limit=limit, since=since)
     
-    def watch(self, callback: Callable[[FlowEvent], None] = None) -> TopicWatcher:
-        """Watch this topic"""
-        return self.client.watch_topic(self.topic_path, callback=callback)
+    def watch(self, callback: Callable[[FlowEvent], None] = None, **batch_options) -> TopicWatcher:
+        """Watch this topic (see FlowClient.watch_topic for batch_options)"""
+        return self.client.watch_topic(self.topic_path, callback=callback, **batch_options)
     
     def stream(self) -> AsyncGenerator[FlowEvent, None]:
         """Stream events from this topic (async generator)"""
@@ -268,20 +563,58 @@ class Topic:
 class FlowClient:
     """Main Flow client with sync/async support"""
     
-    def __init__(self, config: FlowConfig = None, server: str = None, token: str = None):
+    # Instance attributes, set in __init__ and _set_auth_headers
+    config: FlowConfig
+    base_url: str
+    session: requests.Session
+    _headers: Dict[str, str]
+    _json_headers: Dict[str, str]
+    _websocket: Any
+    _ws_lock: asyncio.Lock
+    _watchers: Dict[str, TopicWatcher]
+    _aiohttp_session: Optional[aiohttp.ClientSession]
+    _uses_watch_loop: bool
+    _batch: List[dict]
+    _batch_lock: threading.Lock
+    _batch_timer: Optional[threading.Timer]
+    _batch_error: Optional[Exception]
+    _batch_send_lock: threading.Lock
+    _async_batch: Optional[asyncio.Queue]
+    _async_batch_task: Optional[asyncio.Task]
+    _async_batch_error: Optional[Exception]
+    
+    def __init__(self, config: FlowConfig = None, server: str = None, token: str = None, warmup: bool = False):
         if config:
             self.config = config
         else:
             self.config = FlowConfig(server=server, token=token)
         
-        self.session = requests.Session()
-        if self.config.token:
-            self.session.headers.update({"Authorization": f"Bearer {self.config.token}"})
+        self.base_url = self.config.server.rstrip('/')
+        self.session = _shared_session(self.base_url)
+        self._set_auth_headers(self.config.token)
         
         self._websocket = None
         self._ws_lock = asyncio.Lock()
         self._watchers = {}
         self._aiohttp_session = None
+        self._uses_watch_loop = False
+        
+        # Events waiting for queue_event()'s batched POST
+        self._batch = []
+        self._batch_lock = threading.Lock()
+        self._batch_timer = None
+        self._batch_error = None
+        # Held across each batch POST so batches reach the server in queue order
+        self._batch_send_lock = threading.Lock()
+        
+        # queue_event_async()'s queue and the task that posts from it
+        self._async_batch = None
+        self._async_batch_task = None
+        self._async_batch_error = None
+        
+        if warmup:
+            # Open a pooled connection while the caller is still setting up
+            threading.Thread(target=self._warmup, daemon=True).start()
     
     def __enter__(self):
         return self
@@ -289,6 +622,13 @@ class FlowClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
     
+    def _warmup(self):
+        """Connect to the server ahead of the first real request"""
+        try:
+            self.session.head(self.base_url + "/health", timeout=2)
+        except requests.exceptions.RequestException:
+            pass  # The first real request will report any problem
+    
     async def __aenter__(self):
         return self
     
@@ -297,32 +637,89 @@ class FlowClient:
     
     def close(self):
         """Close client and cleanup resources"""
-        # Stop all watchers
-        for watcher in list(self._watchers.values()):
-            watcher.stop()
-        self._watchers.clear()
+        try:
+            # Send any queued events
+            self.flush()
+        finally:
+            # Stop all watchers
+            for watcher in list(self._watchers.values()):
+                watcher.stop()
+            self._watchers.clear()
+            
+            # Sync watchers fetch events on the shared watcher loop, which then owns
+            # the aiohttp session; close it there
+            if self._uses_watch_loop and self._aiohttp_session is not None:
+                session, self._aiohttp_session = self._aiohttp_session, None
+                closing = asyncio.run_coroutine_threadsafe(session.close(), _WATCH_LOOP)
+                if not _on_watch_loop():
+                    # Waiting from the loop's own thread would only stall it
+                    closing.result(timeout=5)
+    
+    @classmethod
+    def close_all(cls):
+        """Close the HTTP sessions shared by all clients"""
+        with _SESSION_POOL_LOCK:
+            sessions = list(_SESSION_POOL.values())
+            _SESSION_POOL.clear()
+        for session in sessions:
+            session.close()
     
     async def close_async(self):
         """Close client and cleanup resources (async)"""
-        # Close WebSocket
-        if self._websocket:
-            await self._websocket.close()
-            self._websocket = None
+        try:
+            # Send any queued events (flush blocks, so run it off the event loop)
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+            await self.flush_async()
+        finally:
+            if self._async_batch_task is not None:
+                self._async_batch_task.cancel()
+                self._async_batch_task = None
+                self._async_batch = None
+            
+            # Close WebSocket
+            if self._websocket:
+                websocket, self._websocket = self._websocket, None
+                await self._close_on_owner_loop(websocket.close())
+            
+            # Close aiohttp session
+            if self._aiohttp_session:
+                session, self._aiohttp_session = self._aiohttp_session, None
+                await self._close_on_owner_loop(session.close())
+            
+            # Stop all watchers
+            for watcher in list(self._watchers.values()):
+                watcher.stop()
+            self._watchers.clear()
+    
+    def _run_on_watch_loop(self, coro) -> concurrent.futures.Future:
+        """Run a coroutine on the shared watcher loop
         
-        # Close aiohttp session
-        if self._aiohttp_session:
-            await self._aiohttp_session.close()
-            self._aiohttp_session = None
+        The loop then owns this client's websocket and aiohttp session, which
+        close() and close_async() must shut down there.
+        """
+        self._uses_watch_loop = True
+        return asyncio.run_coroutine_threadsafe(coro, _watch_loop())
+    
+    async def _close_on_owner_loop(self, closing):
+        """Await a close() coroutine on the loop that created the resource
         
-        # Stop all watchers
-        for watcher in list(self._watchers.values()):
-            watcher.stop()
-        self._watchers.clear()
+        Connections opened by sync watchers belong to the shared watcher loop
+        and must be closed there, not on the caller's loop.
+        """
+        if self._uses_watch_loop and not _on_watch_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(closing, _WATCH_LOOP))
+        else:
+            await closing
     
     def set_token(self, token: str):
         """Set authentication token"""
         self.config.token = token
-        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        self._set_auth_headers(token)
+    
+    def _set_auth_headers(self, token: Optional[str]):
+        """Build the per-request headers once; they are passed explicitly on each call"""
+        self._headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._json_headers = dict(self._headers, **{"Content-Type": "application/json"})
     
     # Cryptographic helpers
     def _derive_topic_key(self, client_secret: str) -> bytes:
@@ -348,13 +745,12 @@ class FlowClient:
     def _resolve_topic_or_prefix(self, topic_or_prefix: str) -> str:
         """Resolve topic path to hex prefix"""
         # Check if it's a prefix alias first
-        if hasattr(self.config, 'prefix_aliases'):
-            prefix_alias = self.config.resolve_prefix_alias(topic_or_prefix)
-            if prefix_alias:
-                return prefix_alias
+        prefix_alias = self.config.prefix_aliases.get(topic_or_prefix)
+        if prefix_alias:
+            return prefix_alias
         
         # If it looks like a hex prefix, use as-is
-        if all(c in '0123456789abcdefABCDEF' for c in topic_or_prefix) and len(topic_or_prefix) >= 16:
+        if _HEX_PREFIX_RE.match(topic_or_prefix):
             return topic_or_prefix.lower()
         
         # Must be a topic path - compute prefix
@@ -366,10 +762,14 @@ class FlowClient:
     async def _get_aiohttp_session(self):
         """Get or create aiohttp session"""
         if self._aiohttp_session is None or self._aiohttp_session.closed:
-            headers = {}
-            if self.config.token:
-                headers["Authorization"] = f"Bearer {self.config.token}"
-            self._aiohttp_session = aiohttp.ClientSession(headers=headers)
+            # Keep connections to the server alive and reuse resolved addresses
+            # so concurrent send_event_async calls share a warm pool
+            connector = aiohttp.TCPConnector(
+                limit=AIOHTTP_POOL_LIMIT,
+                keepalive_timeout=AIOHTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
         return self._aiohttp_session
     
     async def _make_request_async(self, method: str, endpoint: str, data: dict = None, params: dict = None) -> dict:
@@ -377,15 +777,19 @@ class FlowClient:
         if not self.config.token:
             raise FlowAuthError("No authentication token set")
         
-        url = f"{self.config.server.rstrip('/')}{endpoint}"
+        url = self.base_url + endpoint
         session = await self._get_aiohttp_session()
         
         try:
-            if method == "POST":
-                async with session.post(url, json=data, params=params) as response:
+            if method == "POST" and isinstance(data, bytes):
+                # Body is already encoded JSON
+                async with session.post(url, data=data, params=params, headers=self._json_headers) as response:
+                    return await self._handle_response(response)
+            elif method == "POST":
+                async with session.post(url, json=data, params=params, headers=self._headers) as response:
                     return await self._handle_response(response)
             elif method == "GET":
-                async with session.get(url, params=params) as response:
+                async with session.get(url, params=params, headers=self._headers) as response:
                     return await self._handle_response(response)
             else:
                 raise ValueError(f"Unsupported method: {method}")
@@ -409,22 +813,45 @@ class FlowClient:
             else:
                 raise FlowError(f"HTTP {response.status}: {error_detail}")
         
-        return await response.json()
+        return _loads(await response.read())
+    
+    def _send(self, method: str, url: str, data, params: Optional[dict]) -> requests.Response:
+        """Issue a single HTTP request on the shared session"""
+        if method == "POST" and isinstance(data, bytes):
+            # Body is already encoded JSON
+            return self.session.post(url, data=data, params=params, headers=self._json_headers)
+        elif method == "POST":
+            return self.session.post(url, json=data, params=params, headers=self._headers)
+        elif method == "GET":
+            return self.session.get(url, params=params, headers=self._headers)
+        else:
+            raise ValueError(f"Unsupported method: {method}")
     
-    def _make_request(self, method: str, endpoint: str, data: dict = None, params: dict = None) -> dict:
-        """Make HTTP request to Flow server (sync)"""
+    def _make_request(self, method: str, endpoint: str, data: dict = None, params: dict = None,
+                      retry_backoffs: tuple = ()) -> dict:
+        """Make HTTP request to Flow server (sync)
+        
+        Failures to connect are retried once per entry in retry_backoffs,
+        sleeping that many seconds first. Anything that may have reached the
+        server (dropped connections, HTTP error responses) is not retried, so
+        a retried POST cannot be stored twice.
+        """
         if not self.config.token:
             raise FlowAuthError("No authentication token set")
         
-        url = f"{self.config.server.rstrip('/')}{endpoint}"
+        url = self.base_url + endpoint
         
         try:
-            if method == "POST":
-                response = self.session.post(url, json=data, params=params)
-            elif method == "GET":
-                response = self.session.get(url, params=params)
+            for delay in retry_backoffs:
+                try:
+                    response = self._send(method, url, data, params)
+                    break
+                except requests.exceptions.ConnectionError as e:
+                    if not _never_sent(e):
+                        raise
+                    time.sleep(delay)
             else:
-                raise ValueError(f"Unsupported method: {method}")
+                response = self._send(method, url, data, params)
             
             if not response.ok:
                 try:
@@ -439,7 +866,8 @@ class FlowClient:
                 else:
                     raise FlowError(f"HTTP {response.status_code}: {error_detail}")
             
-            return response.json()
+            # Parse the raw bytes directly rather than via response.json()
+            return _loads(response.content)
         
         except requests.exceptions.RequestException as e:
             raise FlowConnectionError(f"Connection error: {e}")
@@ -478,45 +906,175 @@ class FlowClient:
         self.config.org_id = org_id
     
     # Event operations
-    def send_event(self, body: str, topic: str = None) -> str:
-        """Send event (sync)"""
+    def send_event(self, body: Union[str, bytes], topic: str = None) -> str:
+        """Send event (sync)
+        
+        body may be given as UTF-8 bytes; plain ASCII bytes with nothing to
+        escape are sent without being decoded or re-encoded.
+        """
+        result = self._make_request("POST", "/events", _event_payload(body, topic), retry_backoffs=_BACKOFFS)
+        return result["id"]
+    
+    def queue_event(self, body: str, topic: str = None):
+        """Queue event to be sent in a batch with others (sync)
+        
+        Events queued within BATCH_WINDOW seconds of each other are sent in one
+        request. Use flush() (or close the client) to send immediately. No event
+        ID is returned here; flush() returns the IDs of the events it sends.
+        
+        If a background send failed, its error is raised here (before this
+        event is queued). The unsent events stay queued for the next flush.
+        """
         data = {"body": body}
         if topic:
             data["topic_path"] = topic
         
-        result = self._make_request("POST", "/events", data)
-        return result["id"]
+        with self._batch_lock:
+            error, self._batch_error = self._batch_error, None
+            if error is not None:
+                raise error
+            
+            self._batch.append(data)
+            if len(self._batch) >= BATCH_MAX_EVENTS:
+                full = True
+            else:
+                full = False
+                if self._batch_timer is None:
+                    self._batch_timer = threading.Timer(BATCH_WINDOW, self._flush_in_background)
+                    self._batch_timer.daemon = True
+                    self._batch_timer.start()
+        
+        if full:
+            self.flush()
+    
+    def flush(self) -> List[str]:
+        """Send all queued events now
+        
+        If sending fails the events are put back at the head of the queue and
+        the error is raised.
+        
+        Returns:
+            IDs of the events sent, in queue order
+        """
+        # A full batch flushes on the caller's thread while the timer thread may
+        # still be posting the previous one; taking the send lock first keeps
+        # batches (and re-queued failures) in order
+        with self._batch_send_lock:
+            with self._batch_lock:
+                batch, self._batch = self._batch, []
+                self._batch_error = None
+                if self._batch_timer is not None:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+            
+            if not batch:
+                return []
+            
+            try:
+                result = self._make_request("POST", "/events/batch", batch)
+            except Exception:
+                with self._batch_lock:
+                    self._batch[:0] = batch
+                raise
+        return [event["id"] for event in result]
     
-    async def send_event_async(self, body: str, topic: str = None) -> str:
-        """Send event (async)"""
+    def _flush_in_background(self):
+        """Timer target: flush, keeping any error for the next queue_event()"""
+        try:
+            self.flush()
+        except Exception as e:
+            with self._batch_lock:
+                self._batch_error = e
+    
+    async def queue_event_async(self, body: str, topic: str = None):
+        """Queue event to be sent in a batch with others (async)
+        
+        The async counterpart of queue_event(): events are posted by a
+        background task on the running loop, BATCH_WINDOW seconds after the
+        first one arrives. Use flush_async() (or close_async()) to send
+        immediately. A background send error is raised here, and its events
+        stay queued for the next attempt.
+        """
         data = {"body": body}
         if topic:
             data["topic_path"] = topic
         
-        result = await self._make_request_async("POST", "/events", data)
+        error, self._async_batch_error = self._async_batch_error, None
+        if error is not None:
+            raise error
+        
+        if self._async_batch_task is None:
+            self._async_batch = asyncio.Queue()
+            self._async_batch_task = asyncio.create_task(self._send_batches_async(self._async_batch))
+        self._async_batch.put_nowait(data)
+    
+    async def flush_async(self) -> List[str]:
+        """Send all events queued with queue_event_async() now
+        
+        Returns:
+            IDs of the events sent, in queue order
+        """
+        self._async_batch_error = None
+        if self._async_batch_task is None:
+            return []
+        
+        # The sender task posts everything queued ahead of this marker and
+        # resolves it with the result
+        done = asyncio.get_running_loop().create_future()
+        self._async_batch.put_nowait(done)
+        return await done
+    
+    async def _send_batches_async(self, queue: asyncio.Queue):
+        """Background task posting queue_event_async() events in batches
+        
+        Queue items are event dicts, or futures from flush_async() asking for
+        an immediate send. Events from a failed send are kept and go out first
+        in the next one.
+        """
+        pending = []
+        while True:
+            item = await queue.get()
+            if not isinstance(item, asyncio.Future) and queue.qsize() + len(pending) < BATCH_MAX_EVENTS - 1:
+                # Give other events BATCH_WINDOW to join this batch
+                await asyncio.sleep(BATCH_WINDOW)
+            
+            waiter = None
+            while True:
+                if isinstance(item, asyncio.Future):
+                    waiter = item
+                    break
+                pending.append(item)
+                if len(pending) >= BATCH_MAX_EVENTS or queue.empty():
+                    break
+                item = queue.get_nowait()
+            
+            try:
+                result = await self._make_request_async("POST", "/events/batch", pending) if pending else []
+            except Exception as e:
+                if waiter is None:
+                    self._async_batch_error = e
+                elif not waiter.done():
+                    waiter.set_exception(e)
+                continue
+            
+            pending = []
+            if waiter is not None and not waiter.done():
+                waiter.set_result([event["id"] for event in result])
+    
+    async def send_event_async(self, body: Union[str, bytes], topic: str = None) -> str:
+        """Send event (async), accepting bytes bodies like send_event"""
+        result = await self._make_request_async("POST", "/events", _event_payload(body, topic))
         return result["id"]
     
     def get_event(self, event_id: str) -> FlowEvent:
         """Get specific event by ID (sync)"""
         result = self._make_request("GET", f"/events/{event_id}")
-        return FlowEvent(
-            id=result["id"],
-            body=result["body"],
-            timestamp=result["timestamp"],
-            agent_id=result["agent_id"],
-            body_length=result.get("body_length")
-        )
+        return FlowEvent.from_dict(result)
     
     async def get_event_async(self, event_id: str) -> FlowEvent:
         """Get specific event by ID (async)"""
         result = await self._make_request_async("GET", f"/events/{event_id}")
-        return FlowEvent(
-            id=result["id"],
-            body=result["body"],
-            timestamp=result["timestamp"],
-            agent_id=result["agent_id"],
-            body_length=result.get("body_length")
-        )
+        return FlowEvent.from_dict(result)
     
     def get_history(self, topic_or_prefix: str, limit: int = 100, since: str = None) -> List[FlowEvent]:
         """Get event history (sync)"""
@@ -528,17 +1086,8 @@ class FlowClient:
         
         result = self._make_request("GET", "/events/watch", params=params)
         
-        events = []
-        for event_data in result.get("events", []):
-            events.append(FlowEvent(
-                id=event_data["id"],
-                body=event_data.get("body", ""),
-                timestamp=event_data["timestamp"],
-                agent_id=event_data["agent_id"],
-                body_length=event_data.get("body_length")
-            ))
-        
-        return events
+        from_dict = FlowEvent.from_dict
+        return [from_dict(event_data) for event_data in result.get("events", ())]
     
     async def get_history_async(self, topic_or_prefix: str, limit: int = 100, since: str = None) -> List[FlowEvent]:
         """Get event history (async)"""
@@ -550,17 +1099,8 @@ class FlowClient:
         
         result = await self._make_request_async("GET", "/events/watch", params=params)
         
-        events = []
-        for event_data in result.get("events", []):
-            events.append(FlowEvent(
-                id=event_data["id"],
-                body=event_data.get("body", ""),
-                timestamp=event_data["timestamp"],
-                agent_id=event_data["agent_id"],
-                body_length=event_data.get("body_length")
-            ))
-        
-        return events
+        from_dict = FlowEvent.from_dict
+        return [from_dict(event_data) for event_data in result.get("events", ())]
     
     # Topic sharing
     def share_topic(self, topic_path: str) -> str:
@@ -571,9 +1111,24 @@ class FlowClient:
         return self._compute_topic_prefix(self.config.org_id, topic_path, self.config.client_secret)
     
     # Watching and streaming
-    def watch_topic(self, topic_or_prefix: str, callback: Callable[[FlowEvent], None] = None) -> TopicWatcher:
-        """Watch topic for new events"""
-        watcher = TopicWatcher(self, topic_or_prefix, callback)
+    def watch_topic(self, topic_or_prefix: str, callback: Callable[[FlowEvent], None] = None,
+                    callback_batch: Callable[[List[FlowEvent]], None] = None, batch_size: int = 64,
+                    batch_timeout_ms: int = 10) -> TopicWatcher:
+        """Watch topic for new events
+        
+        Args:
+            topic_or_prefix: Topic path, prefix alias or raw hex prefix
+            callback: Called with each event
+            callback_batch: Called instead with lists of up to batch_size events,
+                flushed batch_timeout_ms after the first event of a batch
+        
+        Async callbacks run on the caller's event loop. Sync callbacks are
+        called directly on a background event loop shared by every sync
+        watcher in the process, so they must not block: one that sleeps or
+        waits on I/O stalls all other sync watchers until it returns. Hand
+        slow work off to your own thread or queue.
+        """
+        watcher = TopicWatcher(self, topic_or_prefix, callback, callback_batch, batch_size, batch_timeout_ms)
         self._watchers[topic_or_prefix] = watcher
         return watcher
     
@@ -653,7 +1208,7 @@ class FlowClient:
                 full_ws_url = f"{ws_url}/events/watch_ws?{query_string}"
                 
                 try:
-                    self._websocket = await websockets.connect(full_ws_url, ping_interval=20, ping_timeout=10)
+                    self._websocket = await websockets.connect(full_ws_url, **WS_CONNECT_OPTIONS)
                 except Exception as e:
                     raise FlowConnectionError(f"Failed to connect WebSocket: {e}")
             
@@ -708,16 +1263,31 @@ class FlowClient:
         }
 
     @classmethod
-    def from_config(cls, config_path: str = None):
+    def from_config(cls, config_path: str = None, warmup: bool = False):
         """Create FlowClient from config file
         
         Args:
             config_path: Optional custom path to config file. If None, uses standard location.
+            warmup: Connect to the server in the background right away
         
         Returns:
             FlowClient instance with loaded configuration
         """
         config = FlowConfig.load(config_path)
+        return cls(config, warmup=warmup)
+
+    @classmethod
+    async def from_config_async(cls, config_path: str = None):
+        """Create FlowClient from config file without blocking the event loop
+        
+        Args:
+            config_path: Optional custom path to config file. If None, uses standard location.
+        
+        Returns:
+            FlowClient instance with loaded configuration
+        """
+        loop = asyncio.get_running_loop()
+        config = await loop.run_in_executor(None, FlowConfig.load, config_path)
         return cls(config)
 
 